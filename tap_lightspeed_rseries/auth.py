@@ -2,16 +2,33 @@
 
 from singer import utils
 import json
+import os
+import stat
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from singer_sdk.authenticators import OAuthAuthenticator, SingletonMeta
 from singer_sdk.helpers._util import utc_now
 from singer_sdk.streams import Stream as RESTStreamBase
-from typing import Optional
+from typing import Any, Callable, Optional
+
+json_loads: Callable[..., Any]
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    json_loads = json.loads
 
 
 class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
     """OAuth 2.0 authenticator for Lightspeed R-Series API."""
 
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    _refresh_lock = threading.Lock()
+
     def __init__(
         self,
         stream: RESTStreamBase,
@@ -20,30 +37,49 @@ class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
     ) -> None:
         super().__init__(stream=stream, auth_endpoint=auth_endpoint, oauth_scopes=oauth_scopes)
         self._tap = stream._tap
+        # Parts of the token request body that never change during a run
+        self._static_body = {
+            "client_id": self.config["client_id"],
+            "client_secret": self.config["client_secret"],
+            "grant_type": "refresh_token",
+        }
+        # Epoch second the current token expires at (None when unknown)
+        self._expires_at_epoch = self._parse_expires(self.config.get("expires"))
         if "access_token" in self.config:
             self.access_token = self.config["access_token"]
 
+    @staticmethod
+    def _parse_expires(expires: Any) -> Optional[int]:
+        """The config's `expires` epoch as an int, or None if missing or unparseable."""
+        if expires is None:
+            return None
+        try:
+            return int(expires)
+        except (TypeError, ValueError):
+            return None
+
     @property
     def oauth_request_body(self) -> dict:
-        """OAuth request body."""
-        return {
-            "client_id": self.config["client_id"],
-            "client_secret": self.config["client_secret"],
-            "grant_type": "refresh_token",
-            "refresh_token": self.config["refresh_token"],
-        }
+        """OAuth request body (the refresh_token is re-read, as it rotates)."""
+        return {**self._static_body, "refresh_token": self._tap._config["refresh_token"]}
 
     def is_token_valid(self) -> bool:
-        """True if we have an access_token (API validates on use)."""
+        """True if we have an access_token that is not about to expire.
+
+        Without a known expiry the token is assumed valid and the API validates it
+        on use.
+        """
         if not hasattr(self, 'access_token') or not self.access_token:
             if "access_token" in self.config:
                 self.access_token = self.config["access_token"]
                 self.logger.debug("Loaded access_token from config for validation check")
-                return True
             else:
                 self.logger.debug("No access_token found in config")
                 return False
-        return True
+        if self._expires_at_epoch is None:
+            return True
+        # Refresh 30 seconds early so in-flight requests don't race the expiry
+        return time.time() < self._expires_at_epoch - 30
 
     @classmethod
     def create_for_stream(cls, stream) -> "LightspeedOAuthAuthenticator":
@@ -52,25 +88,39 @@ class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
             auth_endpoint="https://cloud.lightspeedapp.com/auth/oauth/token",
         )
 
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Shared session for token requests, so retries reuse the TLS connection."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.mount(
+                        "https://cloud.lightspeedapp.com",
+                        HTTPAdapter(pool_connections=2, pool_maxsize=4),
+                    )
+                    cls._session = session
+        return cls._session
+
     def update_access_token(self) -> None:
-        """Refresh access token."""
-        self.logger.info("Requesting new token from OAuth endpoint...")
+        """Refresh access token, unless another caller refreshed it while we waited."""
+        refreshed_before = self.last_refreshed
+        with self._refresh_lock:
+            if self.last_refreshed is not refreshed_before and self.is_token_valid():
+                self.logger.debug("Access token was already refreshed, skipping refresh")
+                return
+            self._refresh_access_token()
+
+    def _refresh_access_token(self) -> None:
+        """Request a new access token and persist it to the config file."""
+        self.logger.debug("OAuth refresh: endpoint=%s", self.auth_endpoint)
         request_time = utc_now()
         current_refresh_token = self._tap._config.get("refresh_token")
         if not current_refresh_token:
             raise RuntimeError("No refresh_token found in config. Cannot refresh access token.")
-        auth_request_payload = {
-            "client_id": self.config["client_id"],
-            "client_secret": self.config["client_secret"],
-            "grant_type": "refresh_token",
-            "refresh_token": current_refresh_token,
-        }
-        self.logger.info("=" * 80)
-        self.logger.info("ATTEMPTING TOKEN REFRESH - Using refresh_token:")
-        self.logger.info(f"refresh_token: {current_refresh_token}")
-        self.logger.info("=" * 80)
-        
-        token_response = requests.post(
+        auth_request_payload = {**self._static_body, "refresh_token": current_refresh_token}
+
+        token_response = self._get_session().post(
             self.auth_endpoint,
             data=auth_request_payload,
             headers={"Content-Type": "application/x-www-form-urlencoded"}
@@ -83,52 +133,52 @@ class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
                     retry_datetime = parsedate_to_datetime(retry_after)
                     wait_seconds = (retry_datetime - utc_now()).total_seconds()
                     if wait_seconds > 0:
-                        import time
                         time.sleep(wait_seconds)
-                        token_response = requests.post(
+                        token_response = self._get_session().post(
                             self.auth_endpoint,
                             data=auth_request_payload,
                             headers={"Content-Type": "application/x-www-form-urlencoded"}
                         )
                 except Exception:
-                    import time
                     time.sleep(60)
-                    token_response = requests.post(
+                    token_response = self._get_session().post(
                         self.auth_endpoint,
                         data=auth_request_payload,
                         headers={"Content-Type": "application/x-www-form-urlencoded"}
                     )
             else:
-                import time
                 time.sleep(60)
-                token_response = requests.post(
+                token_response = self._get_session().post(
                     self.auth_endpoint,
                     data=auth_request_payload,
                     headers={"Content-Type": "application/x-www-form-urlencoded"}
                 )
-        
+
         try:
             token_response.raise_for_status()
-            self.logger.info("OAuth authorization attempt was successful.")
         except Exception as ex:
             error_response = {}
             try:
-                error_response = token_response.json()
-            except:
-                error_response = {"error": "Could not parse error response", "text": token_response.text[:200]}
-            
-            refresh_token_used = auth_request_payload.get("refresh_token", "N/A")
-            self.logger.error("=" * 80)
-            self.logger.error("TOKEN REFRESH FAILED:")
-            self.logger.error(f"refresh_token used: {refresh_token_used}")
-            self.logger.error(f"Error response: {error_response}")
-            self.logger.error(f"HTTP Status: {token_response.status_code}")
-            self.logger.error("=" * 80)
-            
+                error_response = json_loads(token_response.content)
+            except ValueError:
+                # Not JSON (orjson's and json's decode errors are both ValueErrors)
+                error_response = {
+                    "error": "Could not parse error response",
+                    "text": token_response.content[:200].decode(
+                        "utf-8", errors="replace"
+                    ),
+                }
+
+            self.logger.error(
+                "Token refresh failed: HTTP %s, response: %s",
+                token_response.status_code,
+                error_response,
+            )
+
             raise RuntimeError(
                 f"Failed OAuth login, response was '{error_response}'. {ex}"
             )
-        token_json = token_response.json()
+        token_json = json_loads(token_response.content)
         self.access_token = token_json["access_token"]
         self.expires_in = token_json.get("expires_in", 3600)
         if self.expires_in is None:
@@ -138,14 +188,10 @@ class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
                 "expires."
             )
         self.last_refreshed = request_time
-        refresh_token_to_log = token_json.get("refresh_token") or self.config.get("refresh_token", "N/A")
-        
-        self.logger.info("=" * 80)
-        self.logger.info("NEW TOKEN RECEIVED - Full token details:")
-        self.logger.info(f"access_token: {token_json['access_token']}")
-        self.logger.info(f"refresh_token: {refresh_token_to_log}")
-        self.logger.info(f"expires_in: {self.expires_in} seconds")
-        self.logger.info("=" * 80)
+        self.logger.info(
+            "OAuth authorization attempt was successful (expires_in=%s seconds).",
+            self.expires_in,
+        )
         self._tap._config["access_token"] = token_json["access_token"]
         refresh_token_updated = False
         if "refresh_token" in token_json:
@@ -153,18 +199,37 @@ class LightspeedOAuthAuthenticator(OAuthAuthenticator, metaclass=SingletonMeta):
             refresh_token_updated = True
         else:
             self.logger.debug("No refresh_token in response, keeping existing one")
+        self._expires_at_epoch = None
         if self.expires_in:
             expires_timestamp = int(request_time.timestamp()) + int(self.expires_in)
             self._tap._config["expires"] = expires_timestamp
-            from datetime import datetime
-            expires_datetime = datetime.fromtimestamp(expires_timestamp)
-            self.logger.info(f"Token expires at: {expires_datetime.isoformat()}")
+            self._expires_at_epoch = expires_timestamp
+            self.logger.debug("Token expires at epoch %s", expires_timestamp)
         self._tap._config["expires_in"] = self.expires_in
-        with open(self._tap.config_file, "w") as outfile:
-            json.dump(self._tap._config, outfile, indent=4)
-        
-        self.logger.info(
-            f"Tokens saved to config file: {self._tap.config_file}. "
-            f"Access token: updated, "
-            f"Refresh token: {'updated' if refresh_token_updated else 'unchanged'}"
-        )
\ No newline at end of file
+        self._write_config()
+        self.logger.debug(
+            "Tokens saved to config file: %s. Access token: updated, Refresh token: %s",
+            self._tap.config_file,
+            "updated" if refresh_token_updated else "unchanged",
+        )
+
+    def _write_config(self) -> None:
+        """Atomically persist the tap config, keeping the file's mode and symlinks."""
+        config_file = os.path.realpath(self._tap.config_file)
+        try:
+            mode = stat.S_IMODE(os.stat(config_file).st_mode)
+        except FileNotFoundError:
+            mode = 0o600
+        if orjson is not None:
+            content = orjson.dumps(self._tap._config, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(self._tap._config, indent=2).encode()
+        tmp_file = f"{config_file}.tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as outfile:
+            os.fchmod(outfile.fileno(), mode)
+            outfile.write(content)
+            # On disk before the rename, so a crash cannot leave an empty config
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(tmp_file, config_file)
@@ -1,26 +1,161 @@
 """REST client for Lightspeed R-Series API."""
 
-from typing import Any, Dict, Optional
-from pytz import timezone
+import datetime
+import json
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ChunkedEncodingError, ConnectionError as RequestsConnectionError
 from urllib3.exceptions import ProtocolError, ReadTimeoutError
-import copy
+from singer_sdk import Tap
 from singer_sdk.streams import RESTStream
 from singer_sdk.exceptions import RetriableAPIError, FatalAPIError
-from cached_property import cached_property
+from functools import cached_property, wraps
 from tap_lightspeed_rseries.auth import LightspeedOAuthAuthenticator
 import singer
 from singer import StateMessage
 
+json_loads: Callable[..., Any]
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits from the ijson path
+            return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    json_loads = json.loads
+
+    def json_dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_account_fields = itemgetter("accountID", "account_name")
+
+
+class _SyncTurn:
+    """Lock giving one account worker at a time the right to run sync code.
+
+    A worker holds it for its whole child sync, so the SDK's state and output
+    handling never runs on two threads at once. The lock is let go while the
+    worker waits on the API, so requests for different accounts still overlap.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def hold(self):
+        with self._lock:
+            self._local.held = True
+            try:
+                yield
+            finally:
+                self._local.held = False
+
+    @contextmanager
+    def waiting(self):
+        """Release the lock for a blocking wait, if this thread holds it.
+
+        Nested waits are no-ops, as the lock is already released.
+        """
+        if not getattr(self._local, "held", False):
+            yield
+            return
+        self._local.held = False
+        self._lock.release()
+        try:
+            yield
+        finally:
+            self._lock.acquire()
+            self._local.held = True
+
 
 class LightspeedRSeriesStream(RESTStream):
     """Lightspeed R-Series API stream."""
 
     page_size = 100
     timeout = 300
-    records_jsonpath = "$[*]"
+    # JSON schema of the stream's records, handed to the SDK as its `schema`
+    stream_schema: dict = {}
+    # Top-level key holding the records; when unset, any non-@attributes key is used
+    records_key: Optional[str] = None
+    # Nested relation fields emitted as JSON strings (empty values become None)
+    relation_fields: Tuple[str, ...] = ()
+    # Emit relation fields missing from a record as None rather than leaving them out
+    relations_default_to_none = False
+    # Config key listing the relations to load (comma-separated, "all" or "none")
+    relations_config_key: Optional[str] = None
     _replication_key_logged = False
+    _last_refresh_ts = 0.0
+    # 401s arriving within this window reuse the token refreshed by the first one
+    token_refresh_interval = 5
+    # Upper bound, in seconds, on a 429 Retry-After honoured before retrying
+    max_retry_after = 60
+    # Bodies larger than this (in bytes) are decoded one record at a time with ijson
+    stream_parse_threshold = 1_000_000
+    _shared_session: Optional[requests.Session] = None
+    _shared_session_lock = threading.Lock()
+    # Taken by account workers (and the account stream) while they run sync code,
+    # so state updates and stdout writes need no locking of their own
+    _sync_turn = _SyncTurn()
+
+    def __init__(
+        self,
+        tap: Tap,
+        name: Optional[str] = None,
+        schema: Optional[dict] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        self._relations_as_objects = bool(tap.config.get("relations_as_objects"))
+        if schema is None:
+            schema = self.stream_schema
+            if self._relations_as_objects and self.relation_fields:
+                schema = self._schema_with_object_relations(schema)
+        super().__init__(tap, name=name, schema=schema, path=path)
+        self._starting_time_cache: Dict[tuple, Any] = {}
+        self._timestamp_filter_cache: Dict[tuple, Optional[str]] = {}
+        # Decoded bodies, kept only while the response itself is alive
+        self._json_cache: "weakref.WeakKeyDictionary[requests.Response, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._attributes_cache: "weakref.WeakKeyDictionary[requests.Response, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _schema_with_object_relations(self, schema: dict) -> dict:
+        """Copy of the schema typing relation fields as native JSON values."""
+        properties = dict(schema["properties"])
+        for field in self.relation_fields:
+            if field in properties:
+                # Relations the API returns as plain strings are passed through as is
+                properties[field] = {"type": ["object", "array", "string", "null"]}
+        return {**schema, "properties": properties}
+
+    @staticmethod
+    def _context_key(context: Optional[dict]) -> tuple:
+        """Hashable key identifying a stream partition context."""
+        return tuple(sorted((context or {}).items()))
 
     @cached_property
     def url_base(self) -> str:
@@ -28,25 +163,139 @@ class LightspeedRSeriesStream(RESTStream):
         return "https://api.lightspeedapp.com/API/V3"
 
     @property
+    def requests_session(self) -> requests.Session:
+        """HTTP session shared by all streams, so pages reuse pooled connections."""
+        if LightspeedRSeriesStream._shared_session is None:
+            with LightspeedRSeriesStream._shared_session_lock:
+                if LightspeedRSeriesStream._shared_session is None:
+                    # Per account worker, one kept-alive connection per fan-out worker
+                    # plus the prefetcher
+                    concurrency = int(self.config.get("async_concurrency") or 1)
+                    accounts = int(self.config.get("account_concurrency") or 1)
+                    pool_size = max(4, accounts * (concurrency + 1))
+                    session = requests.Session()
+                    session.mount(
+                        "https://api.lightspeedapp.com",
+                        HTTPAdapter(pool_connections=1, pool_maxsize=pool_size),
+                    )
+                    LightspeedRSeriesStream._shared_session = session
+        return LightspeedRSeriesStream._shared_session
+
+    @cached_property
     def authenticator(self) -> LightspeedOAuthAuthenticator:
         """OAuth authenticator for the stream."""
         return LightspeedOAuthAuthenticator.create_for_stream(self)
 
     @property
     def http_headers(self) -> dict:
-        """Request headers."""
-        headers = {}
-        if "user_agent" in self.config:
-            headers["User-Agent"] = self.config.get("user_agent")
-        return headers
+        """Request headers, as a new dict per call (the SDK adds auth headers to it)."""
+        user_agent = self.config.get("user_agent")
+        return {"User-Agent": user_agent} if user_agent else {}
+
+    def _response_json(self, response: requests.Response) -> Any:
+        """Decoded response body, parsed once and shared by the parsing hooks."""
+        if response not in self._json_cache:
+            self._json_cache[response] = json_loads(response.content)
+        return self._json_cache[response]
+
+    def _is_large_response(self, response: requests.Response) -> bool:
+        """True if the body should be decoded incrementally rather than all at once."""
+        return ijson is not None and len(response.content) > self.stream_parse_threshold
+
+    def _response_attributes(self, response: requests.Response) -> dict:
+        """The `@attributes` object (paging info) of a response."""
+        if response not in self._attributes_cache:
+            attributes: dict
+            if self._is_large_response(response):
+                # @attributes leads the document, so this stops reading right after it
+                attributes = next(ijson.items(BytesIO(response.content), "@attributes"), {})
+            else:
+                data = self._response_json(response)
+                attributes = data.get("@attributes", {}) if isinstance(data, dict) else {}
+            self._attributes_cache[response] = attributes
+        return self._attributes_cache[response]
+
+    def _is_records_key(self, key: str) -> bool:
+        """True if a top-level response key holds this stream's records."""
+        if self.records_key:
+            return key == self.records_key
+        return key != "@attributes"
+
+    def _iter_large_response(self, response: requests.Response) -> Iterable[dict]:
+        """Records of a large body, decoded incrementally to bound peak memory."""
+        content = response.content
+        for prefix, event, _ in ijson.parse(BytesIO(content)):
+            if prefix and "." not in prefix and self._is_records_key(prefix):
+                if event == "start_array":
+                    yield from ijson.items(BytesIO(content), f"{prefix}.item", use_float=True)
+                    return
+                if event == "start_map":
+                    yield from ijson.items(BytesIO(content), prefix, use_float=True)
+                    return
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Records from the top-level resource key (a list, or a single object)."""
+        if self._is_large_response(response):
+            yield from self._iter_large_response(response)
+            return
+        data = self._response_json(response)
+        if isinstance(data, list):
+            yield from data
+            return
+        for key, value in data.items():
+            if not self._is_records_key(key):
+                continue
+            if isinstance(value, list):
+                yield from value
+            elif isinstance(value, dict):
+                yield value
+
+    @cached_property
+    def _deselected_properties(self) -> frozenset:
+        """Top-level properties the catalog deselects, dropped before post-processing.
+
+        Streams with children keep every field, as their child contexts are built
+        from the full record.
+        """
+        if not self.selected or self.child_streams:
+            return frozenset()
+        mask = self.mask
+        return frozenset(
+            name for name in self.schema["properties"]
+            if not mask.get(("properties", name), True)
+        )
+
+    @cached_property
+    def _defaulted_relation_fields(self) -> frozenset:
+        """Relation fields set to None when a record lacks them (unless deselected)."""
+        if not self.relations_default_to_none:
+            return frozenset()
+        return frozenset(self.relation_fields) - self._deselected_properties
+
+    def post_process(self, row: dict, context: Optional[dict]) -> dict:
+        """Tag the row with its account and encode relation fields as configured."""
+        for field in row.keys() & self._deselected_properties:
+            del row[field]
+        if context:
+            row["accountID"], row["account_name"] = _account_fields(context)
+        for field in self._defaulted_relation_fields - row.keys():
+            row[field] = None
+        # Only the relation fields present in the row are visited
+        for field in row.keys() & self.relation_fields:
+            value = row[field]
+            if not value:
+                row[field] = None
+            elif not self._relations_as_objects:
+                # Every value is encoded, strings included, so consumers decode them all
+                row[field] = json_dumps(value)
+        return row
 
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
     ) -> Optional[Any]:
         """Next page token or None."""
         try:
-            response_data = response.json()
-            attributes = response_data.get("@attributes", {})
+            attributes = self._response_attributes(response)
             next_url = attributes.get("next", "")
             if not next_url:
                 return None
@@ -55,20 +304,59 @@ class LightspeedRSeriesStream(RESTStream):
             return None
 
     def get_starting_time(self, context: Optional[dict]):
-        """Starting time for incremental sync (from state or start_date)."""
+        """Starting time for incremental sync (from state or start_date).
+
+        The starting value is fixed for the duration of a partition's sync, so it is
+        resolved once per context rather than on every page.
+        """
+        cache_key = self._context_key(context)
+        if cache_key in self._starting_time_cache:
+            return self._starting_time_cache[cache_key]
+
         rep_key = self.get_starting_timestamp(context)
         if not rep_key:
             start_date = self.config.get("start_date")
             if start_date:
                 try:
-                    from pendulum import parse
-                    rep_key = parse(start_date)
+                    rep_key = self._parse_start_date(start_date)
                 except Exception:
                     self.logger.warning(f"Failed to parse start_date: {start_date}")
                     rep_key = None
-        
+
+        self._starting_time_cache[cache_key] = rep_key
         return rep_key
 
+    @staticmethod
+    def _parse_start_date(start_date: str) -> datetime.datetime:
+        """Parse an ISO 8601 start_date, assuming UTC when no offset is given."""
+        try:
+            parsed = datetime.datetime.fromisoformat(start_date.replace("Z", "+00:00"))
+        except ValueError:
+            from pendulum import parse
+            pendulum_parsed = parse(start_date)
+            if not isinstance(pendulum_parsed, datetime.datetime):
+                # e.g. a duration or a bare time, which cannot start a sync
+                raise ValueError(f"start_date is not a date-time: {start_date}")
+            return pendulum_parsed
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed
+
+    @cached_property
+    def load_relations(self) -> Optional[str]:
+        """The load_relations query value, built once from the stream's config key."""
+        if not self.relations_config_key:
+            return None
+        relations = self.config.get(self.relations_config_key, "all")
+        if relations == "all":
+            return "all"
+        if relations.strip().lower() == "none":
+            # Lightweight mode: base records only, no nested relation payloads
+            return None
+        return json_dumps(
+            [relation.strip() for relation in relations.split(",") if relation.strip()]
+        )
+
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
@@ -77,37 +365,15 @@ class LightspeedRSeriesStream(RESTStream):
             return {}
         
         params: dict = {}
-        if self.page_size:
-            params["limit"] = min(self.page_size, 100)
+        page_size = self._get_page_size()
+        if page_size:
+            params["limit"] = min(page_size, 100)
         
         # Incremental sync: timeStamp filter (format: >=,YYYY-MM-DDTHH:MM:SS-00:00)
         if self.replication_key:
-            starting_time = self.get_starting_time(context)
-            if starting_time:
-                # Convert to UTC timezone if needed
-                if hasattr(starting_time, 'astimezone'):
-                    starting_time_utc = starting_time.astimezone(timezone('UTC'))
-                else:
-                    # If it's already a timezone-aware datetime in UTC
-                    starting_time_utc = starting_time
-                
-                # Format according to Lightspeed API: YYYY-MM-DDTHH:MM:SS-00:00
-                time_stamp_str = starting_time_utc.strftime("%Y-%m-%dT%H:%M:%S-00:00")
-                
-                # Use query operator >= with comma separator
-                # Format: timeStamp=%3E%3D,YYYY-MM-DDTHH:MM:SS-00:00
-                # The requests library will URL-encode this, encoding >= to %3E%3D
-                # and the comma to %2C. If the API requires unencoded comma, we may
-                # need to override prepare_request, but let's test this first.
-                params["timeStamp"] = f">=,{time_stamp_str}"
-                
-                # Log replication key info only once per stream
-                if not self._replication_key_logged:
-                    self.logger.info(
-                        f"Incremental sync: filtering records with {self.replication_key} >= {starting_time_utc} "
-                        f"(using API filter: timeStamp={params['timeStamp']})"
-                    )
-                    self._replication_key_logged = True
+            timestamp_filter = self._get_timestamp_filter(context)
+            if timestamp_filter:
+                params["timeStamp"] = timestamp_filter
             else:
                 # Log full sync message only once per stream
                 if not self._replication_key_logged:
@@ -116,8 +382,50 @@ class LightspeedRSeriesStream(RESTStream):
                     )
                     self._replication_key_logged = True
         
+        if self.load_relations:
+            params["load_relations"] = self.load_relations
         return params
 
+    def _get_page_size(self) -> int:
+        """The `limit` sent with each request (capped at the API maximum of 100)."""
+        return self.page_size
+
+    def _get_timestamp_filter(self, context: Optional[dict]) -> Optional[str]:
+        """`timeStamp` query filter for the context, formatted once per partition."""
+        cache_key = self._context_key(context)
+        if cache_key in self._timestamp_filter_cache:
+            return self._timestamp_filter_cache[cache_key]
+
+        timestamp_filter = None
+        starting_time = self.get_starting_time(context)
+        if starting_time:
+            starting_time_utc = starting_time.astimezone(datetime.timezone.utc)
+
+            # Format according to Lightspeed API: YYYY-MM-DDTHH:MM:SS-00:00
+            dt = starting_time_utc
+            time_stamp_str = (
+                f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+                f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}-00:00"
+            )
+
+            # Use query operator >= with comma separator
+            # Format: timeStamp=%3E%3D,YYYY-MM-DDTHH:MM:SS-00:00
+            # The requests library will URL-encode this, encoding >= to %3E%3D
+            # and the comma to %2C. If the API requires unencoded comma, we may
+            # need to override prepare_request, but let's test this first.
+            timestamp_filter = f">=,{time_stamp_str}"
+
+            # Log replication key info only once per stream
+            if not self._replication_key_logged:
+                self.logger.info(
+                    f"Incremental sync: filtering records with {self.replication_key} >= {starting_time_utc} "
+                    f"(using API filter: timeStamp={timestamp_filter})"
+                )
+                self._replication_key_logged = True
+
+        self._timestamp_filter_cache[cache_key] = timestamp_filter
+        return timestamp_filter
+
     def prepare_request(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> requests.PreparedRequest:
@@ -149,62 +457,202 @@ class LightspeedRSeriesStream(RESTStream):
             )
             self.logger.warning(error_msg)
             raise RetriableAPIError(error_msg) from e
+
+    def request_decorator(self, func: Callable) -> Callable:
+        """Retry wrapper that also hands back the sync turn for the whole call.
+
+        Backoff sleeps happen inside the call, so one account's retries do not hold
+        up the other account workers.
+        """
+        decorated = super().request_decorator(func)
+
+        @wraps(decorated)
+        def request_outside_turn(*args, **kwargs):
+            with self._sync_turn.waiting():
+                return decorated(*args, **kwargs)
+
+        return request_outside_turn
     
     def request_records(self, context: Optional[dict]):
-        next_page_token: Any = None
-        finished = False
+        """Records of every page, fetched concurrently when offsets are known up front."""
+        if self.replication_key:
+            # Resolve the filter from state now, as requests run outside the sync turn
+            self._get_timestamp_filter(context)
         decorated_request = self.request_decorator(self.make_request)
-
-        while not finished:
-            resp = decorated_request(context, next_page_token)
-            for row in self.parse_response(resp):
-                yield row
-            previous_token = copy.deepcopy(next_page_token)
-            next_page_token = self.get_next_page_token(
-                response=resp, previous_token=previous_token
+        concurrency = int(self.config.get("async_concurrency") or 1)
+        resp = decorated_request(context, None)
+        page_urls = self._get_fan_out_urls(resp) if concurrency > 1 else None
+        if page_urls is not None:
+            yield from self.parse_response(resp)
+            yield from self._request_fan_out(
+                decorated_request, context, page_urls, concurrency
             )
-            if next_page_token and next_page_token == previous_token:
+        else:
+            yield from self._request_pages_prefetched(decorated_request, context, resp)
+
+    def _request_pages_prefetched(self, decorated_request, context, resp):
+        """Follow next-page links from `resp`, one page after another.
+
+        With page prefetch enabled, page N+1 is fetched while page N is yielded.
+        """
+        next_page_token: Any = None
+        # Offset of the current page; the first page has no offset parameter
+        last_offset: Optional[int] = -1
+        executor = (
+            ThreadPoolExecutor(max_workers=1)
+            if self.config.get("enable_page_prefetch")
+            else None
+        )
+        try:
+            while True:
+                previous_token = next_page_token
+                next_page_token = self.get_next_page_token(
+                    response=resp, previous_token=previous_token
+                )
+                last_offset = self._check_page_advances(
+                    next_page_token, previous_token, last_offset
+                )
+                prefetch = None
+                if next_page_token and executor:
+                    prefetch = executor.submit(decorated_request, context, next_page_token)
+                yield from self.parse_response(resp)
+                if not next_page_token:
+                    break
+                if prefetch:
+                    with self._sync_turn.waiting():
+                        resp = prefetch.result()
+                else:
+                    resp = decorated_request(context, next_page_token)
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+
+    def _check_page_advances(
+        self, next_page_token: Any, previous_token: Any, last_offset: Optional[int]
+    ) -> Optional[int]:
+        """Raise if pagination loops; returns the offset of the next page, if any."""
+        next_offset = self._get_page_offset(next_page_token)
+        if next_offset is not None and last_offset is not None:
+            if next_offset <= last_offset:
                 raise RuntimeError(
                     f"Loop detected in pagination. "
-                    f"Pagination token {next_page_token} is identical to prior token."
+                    f"Next page offset {next_offset} does not advance past {last_offset}."
                 )
-            finished = not next_page_token
+        elif next_page_token and next_page_token == previous_token:
+            raise RuntimeError(
+                f"Loop detected in pagination. "
+                f"Pagination token {next_page_token} is identical to prior token."
+            )
+        return next_offset
+
+    @staticmethod
+    def _get_page_offset(next_page_token: Optional[str]) -> Optional[int]:
+        """The `offset` query parameter of a next-page URL, if it has one."""
+        if not next_page_token:
+            return None
+        offset = parse_qs(urlsplit(next_page_token).query).get("offset")
+        try:
+            return int(offset[0]) if offset else None
+        except ValueError:
+            return None
+
+    def _get_fan_out_urls(self, response: requests.Response) -> Optional[List[str]]:
+        """URLs of all remaining pages, if the first page exposes offset paging.
+
+        Returns None when the response lacks `count`/`limit` attributes or the next
+        URL has no `offset` parameter, in which case pages are followed one by one.
+        """
+        try:
+            attributes = self._response_attributes(response)
+            count = int(attributes["count"])
+            limit = int(attributes["limit"])
+            offset = int(attributes.get("offset", 0))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+        next_url = attributes.get("next")
+        if not next_url or limit <= 0:
+            return None
+        parts = urlsplit(next_url)
+        query = parse_qs(parts.query)
+        if "offset" not in query:
+            return None
+
+        page_urls = []
+        for page_offset in range(offset + limit, count, limit):
+            query["offset"] = [str(page_offset)]
+            page_urls.append(urlunsplit(parts._replace(query=urlencode(query, doseq=True))))
+        return page_urls
+
+    def _request_fan_out(self, decorated_request, context, page_urls, concurrency):
+        """Fetch known page URLs concurrently, yielding records in page order."""
+        urls = iter(page_urls)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = deque(
+                executor.submit(decorated_request, context, url)
+                for url in islice(urls, concurrency)
+            )
+            while pending:
+                with self._sync_turn.waiting():
+                    resp = pending.popleft().result()
+                url = next(urls, None)
+                if url:
+                    pending.append(executor.submit(decorated_request, context, url))
+                yield from self.parse_response(resp)
 
     def validate_response(self, response: requests.Response) -> None:
         if response.status_code in [401]:
-            # Token expired, force refresh by invalidating current token
+            # Token expired, force a refresh (once per burst of 401s)
             self.logger.info("Received 401 Unauthorized, token may have expired. Refreshing token...")
-            if hasattr(self.authenticator, 'access_token'):
-                # Invalidate token to force refresh on next request
-                self.authenticator.access_token = None
-                self.authenticator.last_refreshed = None
-                # Force refresh
+            now = time.monotonic()
+            if now - self._last_refresh_ts >= self.token_refresh_interval:
                 self.authenticator.update_access_token()
+                self._last_refresh_ts = now
                 self.logger.info("Token refreshed after 401 error, request will be retried")
-            
-            msg = (
-                f"{response.status_code} Server Error: "
-                f"{response.reason} for path: {self.path} with response {response.text}"
-            )
-            raise RetriableAPIError(msg)
-        elif response.status_code == 400 and "Please try again later." in response.text:
-            msg = (
-                f"{response.status_code} Server Error: "
-                f"{response.reason} for path: {self.path} with response {response.text}"
-            )
-            raise RetriableAPIError(msg)
+            else:
+                self.logger.info("Token was refreshed moments ago, request will be retried")
+
+            raise RetriableAPIError(self._build_error_msg(response))
+        elif response.status_code == 400 and b"Please try again later." in response.content:
+            raise RetriableAPIError(self._build_error_msg(response))
+        elif response.status_code == 429:
+            # Rate limited (the bucket is per account): wait as long as asked, then retry
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                time.sleep(min(int(retry_after), self.max_retry_after))
+            raise RetriableAPIError(self._build_error_msg(response))
         elif 400 <= response.status_code < 500:
-            msg = (
-                f"{response.status_code} Client Error: "
-                f"{response.reason} for path: {self.path} with response {response.text}"
-            )
-            raise FatalAPIError(msg)
-        elif 500 <= response.status_code < 600 or response.status_code in [401]:
-            msg = (
-                f"{response.status_code} Server Error: "
-                f"{response.reason} for path: {self.path} with response {response.text}"
-            )
-            raise RetriableAPIError(msg)
+            raise FatalAPIError(self._build_error_msg(response, "Client"))
+        elif 500 <= response.status_code < 600:
+            raise RetriableAPIError(self._build_error_msg(response))
+
+    def _build_error_msg(self, response: requests.Response, error_type: str = "Server") -> str:
+        """Error message for a failed response, with the body truncated to 512 bytes."""
+        body = response.content[:512].decode("utf-8", errors="replace")
+        return (
+            f"{response.status_code} {error_type} Error: "
+            f"{response.reason} for path: {self.path} with response {body}"
+        )
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write RECORD messages, serialised with orjson where it can encode them."""
+        for record_message in self._generate_record_messages(record):
+            line = self._dump_message(record_message)
+            if line is None:
+                singer.write_message(record_message)
+            else:
+                # singer flushes the text layer after each write, so bytes stay in order
+                sys.stdout.buffer.write(line)
+
+    @staticmethod
+    def _dump_message(message) -> Optional[bytes]:
+        """Message serialised with orjson, or None to fall back to singer's writer."""
+        if orjson is None or not hasattr(sys.stdout, "buffer"):
+            return None
+        try:
+            return orjson.dumps(message.asdict(), option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # e.g. Decimal values, which singer's simplejson encoder handles
+            return None
 
     def _write_state_message(self) -> None:
         """Write STATE message. Partitions are managed by Singer SDK for incremental sync."""
@@ -1,8 +1,9 @@
 """Stream type classes for tap-lightspeed."""
 
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
 import requests
-import json
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import cached_property
 from singer_sdk import typing as th
 from tap_lightspeed_rseries.client import LightspeedRSeriesStream
 
@@ -15,48 +16,106 @@ class AccountStream(LightspeedRSeriesStream):
     primary_keys = ["accountID"]
     replication_key = None
 
-    records_jsonpath = "$.Account"
+    records_key = "Account"
+    relation_fields = ("link",)
+    _child_executor: Optional[ThreadPoolExecutor] = None
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("name", th.StringType, required=True),
         th.Property("link", th.StringType),
     ).to_dict()
 
     def parse_response(self, response: requests.Response):
-        response_data = response.json()
-        account = response_data.get("Account")
-        if account:
+        response_data = self._response_json(response)
+        account = response_data.get(self.records_key)
+        if isinstance(account, list):
+            yield from account
+        elif account:
             yield account
         else:
             self.logger.warning("Account object not found in response")
 
-    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
-        
+    def _sync_records(self, context: Optional[dict] = None) -> None:
+        """Sync accounts, running each account's child streams on a bounded pool."""
+        workers = int(self.config.get("account_concurrency") or 1)
+        if workers <= 1:
+            super()._sync_records(context)
+            return
+        self._child_futures: List[Future] = []
+        self._child_executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            with self._sync_turn.hold():
+                super()._sync_records(context)
+                with self._sync_turn.waiting():
+                    # Raise the first child failure as soon as it happens
+                    for future in as_completed(self._child_futures):
+                        future.result()
+        except BaseException:
+            for future in self._child_futures:
+                future.cancel()
+            raise
+        finally:
+            # Outside the sync turn, which the running workers still need
+            self._child_executor.shutdown(wait=True)
+            self._child_executor = None
+
+    def _sync_children(self, child_context: Optional[dict]) -> None:
+        if child_context is None:
+            # Account excluded by the account_ids filter
+            return
+        if self._child_executor is None:
+            super()._sync_children(child_context)
+            return
+        self._child_futures.append(
+            self._child_executor.submit(self._sync_account_children, child_context)
+        )
+
+    def _sync_account_children(self, child_context: dict) -> None:
+        """Worker body: sync one account's child streams during its sync turn."""
+        with self._sync_turn.hold():
+            super()._sync_children(child_context)
+
+    @cached_property
+    def _allowed_account_ids(self) -> Optional[frozenset]:
+        """Account IDs from the account_ids filter, or None to sync every account."""
         accounts_ids = self.config.get("account_ids")
-        if accounts_ids:
-            # Handle comma-separated account IDs
-            if isinstance(accounts_ids, str):
-                accounts_ids = [id.strip() for id in accounts_ids.split(",") if id.strip()]
-            elif isinstance(accounts_ids, (int, float)):
-                accounts_ids = [str(accounts_ids)]
-            elif isinstance(accounts_ids, list):
-                accounts_ids = [str(id).strip() for id in accounts_ids if id]
-            
+        if not accounts_ids:
+            return None
+        # Handle comma-separated account IDs
+        if isinstance(accounts_ids, str):
+            accounts_ids = [id.strip() for id in accounts_ids.split(",") if id.strip()]
+        elif isinstance(accounts_ids, (int, float)):
+            accounts_ids = [str(accounts_ids)]
+        elif isinstance(accounts_ids, list):
+            accounts_ids = [str(id).strip() for id in accounts_ids if id]
+        return frozenset(accounts_ids)
+
+    @cached_property
+    def _allowed_account_ids_label(self) -> str:
+        return ", ".join(sorted(self._allowed_account_ids or ()))
+
+    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
+
+        allowed_account_ids = self._allowed_account_ids
+        if allowed_account_ids is not None:
             # Normalize AccountID from record to string for comparison
             record_account_id = str(record.get("accountID", ""))
-            
+
             # Skip this account if it's not in the allowed list
-            if record_account_id not in accounts_ids:
-                self.logger.info(
-                    f"Skipping account '{record.get('name', 'Unknown')}' "
-                    f"({record_account_id}) - not in account_ids filter [{', '.join(accounts_ids)}]"
+            if record_account_id not in allowed_account_ids:
+                self.logger.debug(
+                    "Skipping account '%s' (%s) - not in account_ids filter [%s]",
+                    record.get("name", "Unknown"),
+                    record_account_id,
+                    self._allowed_account_ids_label,
                 )
                 return None
             else:
-                self.logger.info(
-                    f"Processing account '{record.get('name', 'Unknown')}' "
-                    f"({record_account_id}) - matches account_ids filter"
+                self.logger.debug(
+                    "Processing account '%s' (%s) - matches account_ids filter",
+                    record.get("name", "Unknown"),
+                    record_account_id,
                 )
         return {
             "accountID": record.get("accountID"),
@@ -68,16 +127,6 @@ class AccountStream(LightspeedRSeriesStream):
     ) -> Dict[str, Any]:
         return {}
 
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        # Convert link to JSON string for consistency
-        if "link" in row:
-            if row["link"] and row["link"] != "":
-                row["link"] = json.dumps(row["link"])
-            else:
-                row["link"] = None
-        
-        return row
-
 
 class ItemStream(LightspeedRSeriesStream):
     """Define custom stream."""
@@ -88,9 +137,14 @@ class ItemStream(LightspeedRSeriesStream):
     primary_keys = ["itemID"]
     replication_key = "timeStamp"
 
-    records_jsonpath = "$.Item[*]"
+    records_key = "Item"
+    relation_fields = (
+        "Category", "TaxClass", "Manufacturer", "Note", "ItemShops",
+        "ItemVendorNums", "ItemComponents", "ItemUUID", "Prices", "Tags",
+    )
+    relations_config_key = "items_relations"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("itemID", th.StringType, required=True),
@@ -131,38 +185,15 @@ class ItemStream(LightspeedRSeriesStream):
         th.Property("Tags", th.StringType),
     ).to_dict()
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        
-        relations = self.config.get("items_relations", "all")
-        
-        if relations != "all":
-            relations = [relation.strip() for relation in relations.split(",") if relation.strip()]
-            params["load_relations"] = json.dumps(relations)
-        else:
-            params["load_relations"] = "all"
-        return params
+    @cached_property
+    def _selected_keys(self) -> frozenset:
+        return frozenset(self.schema["properties"]) - self._deselected_properties
 
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert all relation fields to JSON strings for simplicity
-        relation_fields = [
-            "Category", "TaxClass", "Manufacturer", "Note", "ItemShops",
-            "ItemVendorNums", "ItemComponents", "ItemUUID", "Prices", "Tags"
-        ]
-        for field in relation_fields:
-            if field in row:
-                if row[field] and row[field] != "":
-                    row[field] = json.dumps(row[field])
-                else:
-                    row[field] = None
-        
-        return row
+    def parse_response(self, response: requests.Response):
+        # Keep only selected schema keys so unused relation subtrees are dropped early
+        keys = self._selected_keys
+        for record in super().parse_response(response):
+            yield {key: value for key, value in record.items() if key in keys}
 
 
 class VendorStream(LightspeedRSeriesStream):
@@ -174,9 +205,12 @@ class VendorStream(LightspeedRSeriesStream):
     primary_keys = ["vendorID"]
     replication_key = "timeStamp"
 
-    records_jsonpath = "$.Vendor[*]"
+    records_key = "Vendor"
+    relation_fields = ("Contact", "purchasingCurrency", "Reps")
+    relations_default_to_none = True
+    relations_config_key = "vendors_relations"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("vendorID", th.StringType, required=True),
@@ -195,36 +229,6 @@ class VendorStream(LightspeedRSeriesStream):
         th.Property("Reps", th.StringType),
     ).to_dict()
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        
-        relations = self.config.get("vendors_relations", "all")
-        
-        if relations != "all":
-            relations = [relation.strip() for relation in relations.split(",") if relation.strip()]
-            params["load_relations"] = json.dumps(relations)
-        else:
-            params["load_relations"] = "all"
-        return params
-
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert all relation fields to JSON strings for simplicity
-        relation_fields = ["Contact", "purchasingCurrency", "Reps"]
-        for field in relation_fields:
-            if field in row:
-                if row[field] and row[field] != "":
-                    row[field] = json.dumps(row[field])
-            else:
-                    row[field] = None
-        
-        return row
-
 
 class OrderStream(LightspeedRSeriesStream):
     """Define custom stream."""
@@ -235,9 +239,11 @@ class OrderStream(LightspeedRSeriesStream):
     primary_keys = ["orderID"]
     replication_key = "timeStamp"
 
-    records_jsonpath = "$.Order[*]"
+    records_key = "Order"
+    relation_fields = ("OrderLines",)
+    relations_config_key = "orders_relations"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("orderID", th.StringType, required=True),
@@ -280,64 +286,44 @@ class OrderStream(LightspeedRSeriesStream):
     ).to_dict()
 
     def parse_response(self, response: requests.Response):
+        body = response.content
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
-            self.logger.error(f"HTTP error in Order response: {e}")
-            self.logger.error(f"Response status: {response.status_code}")
-            self.logger.error(f"Response text: {response.text[:500]}")
+            self.logger.error("HTTP error in Order response: %s", e)
+            self.logger.error("Response status: %s", response.status_code)
+            self.logger.error(
+                "Response text: %s", body[:500].decode("utf-8", errors="replace")
+            )
             raise
         
-        if not response.text or not response.text.strip():
+        if not body or not body.strip():
             self.logger.warning("Empty response from Order endpoint")
             return
         
+        if self._is_large_response(response):
+            yield from self._iter_large_response(response)
+            return
+        
         try:
-            response_data = response.json()
+            response_data = self._response_json(response)
         except ValueError as e:
-            self.logger.error(f"Failed to parse JSON response: {e}")
-            self.logger.error(f"Response status: {response.status_code}")
-            self.logger.error(f"Response text: {response.text[:500]}")
+            self.logger.error("Failed to parse JSON response: %s", e)
+            self.logger.error("Response status: %s", response.status_code)
+            self.logger.error(
+                "Response text: %s", body[:500].decode("utf-8", errors="replace")
+            )
             raise
         
         order = response_data.get("Order")
         if order:
             if isinstance(order, list):
-                for o in order:
-                    yield o
+                yield from order
             elif isinstance(order, dict):
                 yield order
         else:
             self.logger.warning("Order object not found in response")
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        
-        relations = self.config.get("orders_relations", "all")
-        
-        if relations != "all":
-            relations = [relation.strip() for relation in relations.split(",") if relation.strip()]
-            params["load_relations"] = json.dumps(relations)
-        else:
-            params["load_relations"] = "all"
-        return params
-
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert OrderLines to JSON string for simplicity
-        if "OrderLines" in row:
-            if row["OrderLines"] and row["OrderLines"] != "":
-                row["OrderLines"] = json.dumps(row["OrderLines"])
-            else:
-                row["OrderLines"] = None
-        
-        return row
-
 
 class SaleStream(LightspeedRSeriesStream):
     """Define custom stream."""
@@ -348,9 +334,11 @@ class SaleStream(LightspeedRSeriesStream):
     primary_keys = ["saleID"]
     replication_key = "timeStamp"
 
-    records_jsonpath = "$.Sale[*]"
+    records_key = "Sale"
+    relation_fields = ("SaleLines", "MetaData")
+    relations_config_key = "sales_relations"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("saleID", th.StringType, required=True),
@@ -404,37 +392,6 @@ class SaleStream(LightspeedRSeriesStream):
         th.Property("MetaData", th.StringType),
     ).to_dict()
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        
-        relations = self.config.get("sales_relations", "all")
-        
-        if relations != "all":
-            relations = [relation.strip() for relation in relations.split(",") if relation.strip()]
-            params["load_relations"] = json.dumps(relations)
-        else:
-            params["load_relations"] = "all"
-        
-        return params
-
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert relation fields to JSON strings for simplicity
-        relation_fields = ["SaleLines", "MetaData"]
-        for field in relation_fields:
-            if field in row:
-                if row[field] and row[field] != "":
-                    row[field] = json.dumps(row[field])
-                else:
-                    row[field] = None
-        
-        return row
-
 
 class ShipmentStream(LightspeedRSeriesStream):
     """Define Shipment stream for Order Shipments.
@@ -449,9 +406,11 @@ class ShipmentStream(LightspeedRSeriesStream):
     primary_keys = ["orderShipmentID"]
     replication_key = "timeStamp"
 
-    records_jsonpath = "$.OrderShipment[*]"
+    records_key = "OrderShipment"
+    relation_fields = ("Employee", "Order", "OrderShipmentItems")
+    relations_config_key = "shipments_relations"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("orderShipmentID", th.StringType, required=True),
@@ -488,38 +447,9 @@ class ShipmentStream(LightspeedRSeriesStream):
         th.Property("OrderShipmentItems", th.StringType),
     ).to_dict()
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        
-        relations = self.config.get("shipments_relations", "all")
-        
-        if relations != "all":
-            relations = [relation.strip() for relation in relations.split(",") if relation.strip()]
-            params["load_relations"] = json.dumps(relations)
-        else:
-            params["load_relations"] = "all"
-            # Reduzir limit quando carregar todas as relações para evitar timeout
-            params["limit"] = 50  # Reduzir de 100 para 50
-        
-        return params
-
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert all relation fields to JSON strings for simplicity
-        relation_fields = ["Employee", "Order", "OrderShipmentItems"]
-        for field in relation_fields:
-            if field in row:
-                if row[field] and row[field] != "":
-                    row[field] = json.dumps(row[field])
-                else:
-                    row[field] = None
-        
-        return row
+    def _get_page_size(self) -> int:
+        # Reduzir limit quando carregar todas as relações para evitar timeout
+        return 50 if self.load_relations == "all" else self.page_size
 
 
 class ShopStream(LightspeedRSeriesStream):
@@ -535,9 +465,14 @@ class ShopStream(LightspeedRSeriesStream):
     primary_keys = ["shopID"]
     replication_key = None
 
-    records_jsonpath = "$.Shop[*]"
+    records_key = "Shop"
+    relation_fields = (
+        "Contact", "ReceiptSetup", "TaxCategory", "ShelfLocations",
+        "Registers", "CCGateway", "PriceLevel",
+    )
+    load_relations = "all"
 
-    schema = th.PropertiesList(
+    stream_schema = th.PropertiesList(
         th.Property("accountID", th.StringType, required=True),
         th.Property("account_name", th.StringType),
         th.Property("shopID", th.StringType, required=True),
@@ -566,29 +501,3 @@ class ShopStream(LightspeedRSeriesStream):
         th.Property("CCGateway", th.StringType),
         th.Property("PriceLevel", th.StringType),
     ).to_dict()
-
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        params = super().get_url_params(context, next_page_token)
-        params["load_relations"] = "all"
-        return params
-
-    def post_process(self, row: dict, context: Optional[dict]) -> dict:
-        if context:
-            row["accountID"] = context.get("accountID")
-            row["account_name"] = context.get("account_name")
-        
-        # Convert all relation fields to JSON strings for simplicity
-        relation_fields = [
-            "Contact", "ReceiptSetup", "TaxCategory", "ShelfLocations",
-            "Registers", "CCGateway", "PriceLevel"
-        ]
-        for field in relation_fields:
-            if field in row:
-                if row[field] and row[field] != "":
-                    row[field] = json.dumps(row[field])
-                else:
-                    row[field] = None
-        
-        return row
\ No newline at end of file
@@ -78,31 +78,81 @@ class TapRLightspeed(Tap):
             "items_relations",
             th.StringType,
             required=False,
-            description="Optional items relations to sync. If not provided, all relations will be synced.",
+            description=(
+                "Optional items relations to sync. If not provided, all relations will "
+                "be synced. Use \"none\" to sync no relations."
+            ),
         ),
         th.Property(
             "vendors_relations",
             th.StringType,
             required=False,
-            description="Optional vendors relations to sync. If not provided, all relations will be synced.",
+            description=(
+                "Optional vendors relations to sync. If not provided, all relations "
+                "will be synced. Use \"none\" to sync no relations."
+            ),
         ),
         th.Property(
             "orders_relations",
             th.StringType,
             required=False,
-            description="Optional orders relations to sync. If not provided, all relations will be synced.",
+            description=(
+                "Optional orders relations to sync. If not provided, all relations "
+                "will be synced. Use \"none\" to sync no relations."
+            ),
             ),
         th.Property(
             "sales_relations",
             th.StringType,
             required=False,
-            description="Optional sales relations to sync. If not provided, all relations will be synced.",
+            description=(
+                "Optional sales relations to sync. If not provided, all relations will "
+                "be synced. Use \"none\" to sync no relations."
+            ),
         ),
         th.Property(
             "shipments_relations",
             th.StringType,
             required=False,
-            description="Optional shipments relations to sync. If not provided, all relations will be synced.",
+            description=(
+                "Optional shipments relations to sync. If not provided, all relations "
+                "will be synced. Use \"none\" to sync no relations."
+            ),
+        ),
+        th.Property(
+            "enable_page_prefetch",
+            th.BooleanType,
+            required=False,
+            description=(
+                "Fetch the next page in the background while the current page is being "
+                "processed."
+            ),
+        ),
+        th.Property(
+            "async_concurrency",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Number of pages to fetch concurrently when the API reports the total "
+                "record count. Default is 1 (sequential)."
+            ),
+        ),
+        th.Property(
+            "account_concurrency",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Number of accounts whose child streams sync in parallel. Default is 1 "
+                "(sequential)."
+            ),
+        ),
+        th.Property(
+            "relations_as_objects",
+            th.BooleanType,
+            required=False,
+            description=(
+                "Emit relation fields as JSON objects instead of JSON-encoded strings."
+            ),
         ),
     ).to_dict()
 
@@ -0,0 +1,86 @@
+"""Shared fixtures: taps built from a temporary config and a fake Lightspeed API."""
+
+import json
+from typing import Callable, List, Optional
+
+import pytest
+import requests
+
+from tap_lightspeed_rseries.auth import LightspeedOAuthAuthenticator
+from tap_lightspeed_rseries.client import LightspeedRSeriesStream
+from tap_lightspeed_rseries.tap import TapRLightspeed
+
+SAMPLE_CONFIG = {
+    "client_id": "client-id",
+    "client_secret": "client-secret",
+    "refresh_token": "refresh-1",
+    "access_token": "access-1",
+    "start_date": "2020-01-01T00:00:00Z",
+}
+
+
+def make_response(
+    request: requests.PreparedRequest,
+    status_code: int = 200,
+    body=None,
+    headers: Optional[dict] = None,
+) -> requests.Response:
+    """A response to `request`, with `body` JSON-encoded unless it is bytes."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    response.headers.update(headers or {"Content-Type": "application/json"})
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if status_code < 400 else "Error"
+    return response
+
+
+class FakeAPI:
+    """Stand-in for the HTTP layer, answering every request with `handler`."""
+
+    def __init__(self) -> None:
+        self.requests: List[requests.PreparedRequest] = []
+        self.handler: Callable[[requests.PreparedRequest], requests.Response] = (
+            lambda request: make_response(request, 404, {"message": "not found"})
+        )
+
+    def send(self, session, request, **kwargs) -> requests.Response:
+        self.requests.append(request)
+        return self.handler(request)
+
+    @property
+    def urls(self) -> List[str]:
+        return [request.url for request in self.requests]
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Drop the authenticator singleton and shared sessions between tests."""
+    yield
+    LightspeedOAuthAuthenticator._SingletonMeta__single_instance = None
+    LightspeedOAuthAuthenticator._session = None
+    LightspeedRSeriesStream._shared_session = None
+
+
+@pytest.fixture
+def fake_api(monkeypatch) -> FakeAPI:
+    api = FakeAPI()
+    monkeypatch.setattr(
+        requests.Session,
+        "send",
+        lambda session, request, **kwargs: api.send(session, request, **kwargs),
+    )
+    # Retries back off without waiting
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    return api
+
+
+@pytest.fixture
+def make_tap(tmp_path) -> Callable[..., TapRLightspeed]:
+    def _make_tap(**config) -> TapRLightspeed:
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({**SAMPLE_CONFIG, **config}))
+        return TapRLightspeed(config=[str(config_file)], parse_env_config=False)
+
+    return _make_tap
@@ -0,0 +1,39 @@
+"""Tests for the OAuth authenticator in auth.py."""
+
+import json
+import os
+import stat
+
+from tests.conftest import make_response
+
+
+def test_refresh_persists_rotated_tokens(make_tap, fake_api, tmp_path):
+    fake_api.handler = lambda request: make_response(
+        request,
+        200,
+        {"access_token": "access-2", "refresh_token": "refresh-2", "expires_in": 60},
+    )
+    config_file = tmp_path / "config.json"
+    tap = make_tap()
+    os.chmod(config_file, 0o600)
+
+    tap.streams["items"].authenticator.update_access_token()
+
+    saved = json.loads(config_file.read_text())
+    assert saved["access_token"] == "access-2"
+    assert saved["refresh_token"] == "refresh-2"
+    assert isinstance(saved["expires"], int)
+    assert stat.S_IMODE(os.stat(config_file).st_mode) == 0o600
+    assert not (tmp_path / "config.json.tmp").exists()
+
+
+def test_expires_from_config_is_coerced_to_an_epoch(make_tap):
+    authenticator = make_tap(expires="1700000000").streams["items"].authenticator
+    assert authenticator._expires_at_epoch == 1700000000
+    assert not authenticator.is_token_valid()
+
+
+def test_unparseable_expires_is_treated_as_unknown(make_tap):
+    authenticator = make_tap(expires="soon").streams["items"].authenticator
+    assert authenticator._expires_at_epoch is None
+    assert authenticator.is_token_valid()
@@ -0,0 +1,232 @@
+"""Tests for the shared Lightspeed stream behaviour in client.py."""
+
+import json
+import time
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import pytest
+import requests
+from singer_sdk.exceptions import RetriableAPIError
+
+from tests.conftest import make_response
+
+CONTEXT = {"accountID": "1", "account_name": "Acme"}
+API_URL = "https://api.lightspeedapp.com/API/V3"
+
+
+def _response(body, status_code=200, headers=None) -> requests.Response:
+    request = requests.Request("GET", f"{API_URL}/Account/1/Item.json").prepare()
+    return make_response(request, status_code, body, headers)
+
+
+def test_post_process_encodes_relations_as_compact_json(make_tap):
+    vendors = make_tap().streams["vendors"]
+    row = {
+        "vendorID": "7",
+        "Contact": {"email": "a@b.c", "phones": [1, 2]},
+        "Reps": [{"repID": "1"}],
+        "purchasingCurrency": "",
+    }
+
+    result = vendors.post_process(row, CONTEXT)
+
+    assert result["Contact"] == '{"email":"a@b.c","phones":[1,2]}'
+    assert result["Reps"] == '[{"repID":"1"}]'
+    assert result["purchasingCurrency"] is None
+    assert result["accountID"] == "1"
+    assert result["account_name"] == "Acme"
+
+
+@pytest.mark.parametrize(
+    "config, expected", [({}, '"EUR"'), ({"relations_as_objects": True}, "EUR")]
+)
+def test_post_process_string_relations(make_tap, config, expected):
+    vendors = make_tap(**config).streams["vendors"]
+
+    result = vendors.post_process({"vendorID": "7", "Contact": "EUR"}, CONTEXT)
+
+    # JSON-encoded like any other relation, unless relations are emitted as objects
+    assert result["Contact"] == expected
+
+
+def test_post_process_relations_as_objects(make_tap):
+    vendors = make_tap(relations_as_objects=True).streams["vendors"]
+    contact = {"email": "a@b.c"}
+
+    result = vendors.post_process(
+        {"vendorID": "7", "Contact": contact, "Reps": {}}, CONTEXT
+    )
+
+    assert result["Contact"] == contact
+    assert result["Reps"] is None
+    relation_type = vendors.schema["properties"]["Contact"]["type"]
+    assert {"object", "array", "string", "null"} <= set(relation_type)
+    # Non-relation columns keep their declared types
+    assert vendors.schema["properties"]["vendorID"]["type"] == ["string"]
+
+
+def test_order_large_body_is_parsed_incrementally(make_tap, monkeypatch):
+    pytest.importorskip("ijson")
+    orders = make_tap().streams["orders"]
+    records = [
+        {"orderID": "1", "OrderLines": {"OrderLine": [{"qty": 1.5}]}},
+        {"orderID": "2", "OrderLines": ""},
+    ]
+    body = {"@attributes": {"count": "2"}, "Order": records}
+    monkeypatch.setattr(orders, "stream_parse_threshold", 0)
+    monkeypatch.setattr(
+        "tap_lightspeed_rseries.client.json_loads",
+        lambda content: pytest.fail("large bodies must not be decoded in one go"),
+    )
+
+    assert list(orders.parse_response(_response(body))) == records
+    # A single order comes back as an object rather than a list
+    single = {"@attributes": {"count": "1"}, "Order": records[0]}
+    assert list(orders.parse_response(_response(single))) == [records[0]]
+
+
+def test_401_burst_refreshes_the_token_once(make_tap, monkeypatch):
+    items = make_tap().streams["items"]
+    refreshes = []
+    monkeypatch.setattr(
+        items.authenticator, "update_access_token", lambda: refreshes.append(1)
+    )
+    unauthorized = _response({"message": "expired"}, 401)
+
+    for _ in range(3):
+        with pytest.raises(RetriableAPIError):
+            items.validate_response(unauthorized)
+
+    assert len(refreshes) == 1
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected_sleeps",
+    [("5", [5]), ("3600", [60]), ("Wed, 21 Oct 2015 07:28:00 GMT", []), (None, [])],
+)
+def test_429_sleeps_for_retry_after_within_the_cap(
+    make_tap, monkeypatch, retry_after, expected_sleeps
+):
+    items = make_tap().streams["items"]
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    headers = {"Retry-After": retry_after} if retry_after else {}
+
+    with pytest.raises(RetriableAPIError):
+        items.validate_response(_response({"message": "slow down"}, 429, headers))
+
+    assert sleeps == expected_sleeps
+    assert items.max_retry_after == 60
+
+
+def test_relation_values_round_trip_through_json(make_tap):
+    sales = make_tap().streams["sales"]
+    lines = {"SaleLine": [{"itemID": "1", "unitPrice": "9.99"}]}
+
+    result = sales.post_process({"saleID": "1", "SaleLines": lines}, CONTEXT)
+
+    assert json.loads(result["SaleLines"]) == lines
+
+
+def _paged_vendors(total: int, limit: int):
+    """Handler serving `total` vendors, `limit` per page, linked by offset URLs."""
+
+    def handler(request):
+        url = urlsplit(request.url)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        offset = int(query.get("offset", 0))
+        end = min(offset + limit, total)
+        vendors = [{"vendorID": str(i)} for i in range(offset, end)]
+        attributes = {"count": str(total), "limit": str(limit), "offset": str(offset)}
+        if offset + limit < total:
+            query["offset"] = str(offset + limit)
+            attributes["next"] = url._replace(query=urlencode(query)).geturl()
+        else:
+            attributes["next"] = ""
+        body = {"@attributes": attributes, "Vendor": vendors}
+        return make_response(request, 200, body)
+
+    return handler
+
+
+def _offsets(urls):
+    return [parse_qs(urlsplit(url).query).get("offset", ["0"])[0] for url in urls]
+
+
+@pytest.mark.parametrize("config", [{}, {"enable_page_prefetch": True}])
+def test_next_links_are_followed_in_order(make_tap, fake_api, config):
+    fake_api.handler = _paged_vendors(total=5, limit=2)
+    vendors = make_tap(**config).streams["vendors"]
+
+    records = list(vendors.request_records(CONTEXT))
+
+    assert [record["vendorID"] for record in records] == ["0", "1", "2", "3", "4"]
+    assert _offsets(fake_api.urls) == ["0", "2", "4"]
+
+
+def test_prefetch_requests_the_next_page_while_yielding(make_tap, fake_api):
+    fake_api.handler = _paged_vendors(total=4, limit=2)
+    vendors = make_tap(enable_page_prefetch=True).streams["vendors"]
+    records = vendors.request_records(CONTEXT)
+
+    assert next(records)["vendorID"] == "0"
+    deadline = time.monotonic() + 5
+    while len(fake_api.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _offsets(fake_api.urls) == ["0", "2"]
+    assert [record["vendorID"] for record in records] == ["1", "2", "3"]
+
+
+def test_fan_out_fetches_known_offsets_and_keeps_page_order(make_tap, fake_api):
+    fake_api.handler = _paged_vendors(total=9, limit=2)
+    vendors = make_tap(async_concurrency=3).streams["vendors"]
+
+    records = list(vendors.request_records(CONTEXT))
+
+    assert [record["vendorID"] for record in records] == [str(i) for i in range(9)]
+    assert sorted(_offsets(fake_api.urls), key=int) == ["0", "2", "4", "6", "8"]
+
+
+def test_fan_out_falls_back_to_next_links_without_a_count(make_tap, fake_api):
+    paged = _paged_vendors(total=3, limit=2)
+
+    def handler(request):
+        response = paged(request)
+        body = json.loads(response.content)
+        del body["@attributes"]["count"]
+        return make_response(request, 200, body)
+
+    fake_api.handler = handler
+    vendors = make_tap(async_concurrency=3).streams["vendors"]
+
+    records = list(vendors.request_records(CONTEXT))
+
+    assert [record["vendorID"] for record in records] == ["0", "1", "2"]
+    assert _offsets(fake_api.urls) == ["0", "2"]
+
+
+def test_offset_that_does_not_advance_is_a_loop(make_tap, fake_api):
+    def handler(request):
+        next_url = f"{API_URL}/Account/1/Vendor.json?offset=2"
+        body = {"@attributes": {"next": next_url}, "Vendor": [{"vendorID": "1"}]}
+        return make_response(request, 200, body)
+
+    fake_api.handler = handler
+    vendors = make_tap().streams["vendors"]
+
+    with pytest.raises(RuntimeError, match="does not advance"):
+        list(vendors.request_records(CONTEXT))
+    assert len(fake_api.requests) == 2
+
+
+def test_repeated_next_token_without_offset_is_a_loop(make_tap, fake_api):
+    def handler(request):
+        next_url = f"{API_URL}/Account/1/Vendor.json?after=abc"
+        body = {"@attributes": {"next": next_url}, "Vendor": [{"vendorID": "1"}]}
+        return make_response(request, 200, body)
+
+    fake_api.handler = handler
+    vendors = make_tap().streams["vendors"]
+
+    with pytest.raises(RuntimeError, match="identical to prior token"):
+        list(vendors.request_records(CONTEXT))
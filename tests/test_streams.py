@@ -0,0 +1,184 @@
+"""Tests for the stream classes in streams.py."""
+
+import json
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_lightspeed_rseries.streams import VendorStream
+from tests.conftest import make_response
+
+# Records key and primary key of each child resource
+RESOURCES = {
+    "Item": ("Item", "itemID"),
+    "Vendor": ("Vendor", "vendorID"),
+    "Order": ("Order", "orderID"),
+    "Sale": ("Sale", "saleID"),
+    "Shipment": ("OrderShipment", "orderShipmentID"),
+    "Shop": ("Shop", "shopID"),
+}
+
+
+class AccountsAPI:
+    """Handler serving `account_count` accounts, each with two records per resource.
+
+    Child requests take `delay` seconds, and the peak number of requests in flight
+    at once is kept in `max_in_flight`.
+    """
+
+    def __init__(self, account_count: int, delay: float = 0.0) -> None:
+        self.account_count = account_count
+        self.delay = delay
+        self.failing_account = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        path = urlsplit(request.url).path
+        if path.endswith("/Account.json"):
+            accounts = [
+                {"accountID": str(i), "name": f"Account {i}"}
+                for i in range(1, self.account_count + 1)
+            ]
+            return make_response(request, 200, {"Account": accounts})
+
+        account_id, filename = path.split("/")[-2:]
+        if account_id == self.failing_account:
+            return make_response(request, 400, {"message": "bad request"})
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # A real sleep: the fake_api fixture stubs out time.sleep
+        threading.Event().wait(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        key, primary_key = RESOURCES[filename[: -len(".json")]]
+        records = [
+            {primary_key: f"{account_id}-{i}", "timeStamp": "2024-01-01T00:00:00+00:00"}
+            for i in range(2)
+        ]
+        return make_response(request, 200, {"@attributes": {"next": ""}, key: records})
+
+
+def _messages(output: str):
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_accounts_sync_concurrently_with_serialised_output(
+    make_tap, fake_api, capsys, monkeypatch
+):
+    api = AccountsAPI(account_count=6, delay=0.05)
+    fake_api.handler = api
+    active = []
+    max_active = []
+    post_process = VendorStream.post_process
+
+    def exclusive_post_process(self, row, context):
+        # Sync code for two accounts must never run at the same time
+        active.append(1)
+        max_active.append(len(active))
+        threading.Event().wait(0.001)
+        active.pop()
+        return post_process(self, row, context)
+
+    monkeypatch.setattr(VendorStream, "post_process", exclusive_post_process)
+
+    make_tap(account_concurrency=3).sync_all()
+
+    messages = _messages(capsys.readouterr().out)
+    account_ids = {str(i) for i in range(1, 7)}
+    for stream in ("items", "vendors", "orders", "sales", "shipments", "shops"):
+        records = [
+            m["record"]
+            for m in messages
+            if m["type"] == "RECORD" and m["stream"] == stream
+        ]
+        assert len(records) == 12
+        assert {record["accountID"] for record in records} == account_ids
+    assert api.max_in_flight > 1
+    assert max(max_active) == 1
+    final_state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    partitions = final_state["bookmarks"]["items"]["partitions"]
+    assert {p["context"]["accountID"] for p in partitions} == account_ids
+
+
+def test_account_failure_stops_the_remaining_accounts(make_tap, fake_api, capsys):
+    api = AccountsAPI(account_count=6, delay=0.2)
+    api.failing_account = "2"
+    fake_api.handler = api
+
+    with pytest.raises(FatalAPIError):
+        make_tap(account_concurrency=2).sync_all()
+
+    requested = {urlsplit(url).path.split("/")[-2] for url in fake_api.urls}
+    assert "2" in requested
+    # Accounts still queued when account 2 failed were never started
+    assert not requested & {"5", "6"}
+
+
+def test_one_accounts_backoff_does_not_block_the_others(
+    make_tap, fake_api, monkeypatch
+):
+    api = AccountsAPI(account_count=2)
+    failed = threading.Event()
+    served = []
+
+    def handler(request):
+        account_id = urlsplit(request.url).path.split("/")[-2]
+        if account_id == "1" and not failed.is_set():
+            failed.set()
+            return make_response(request, 500, {"message": "server error"})
+        if account_id == "2":
+            failed.wait(5)
+        response = api(request)
+        served.append(account_id)
+        return response
+
+    fake_api.handler = handler
+    # Account 1 backs off before retrying its failed request
+    monkeypatch.setattr("time.sleep", lambda seconds: threading.Event().wait(0.5))
+
+    make_tap(account_concurrency=2).sync_all()
+
+    retry = served.index("1")
+    assert served[:retry].count("2") == len(RESOURCES)
+    assert served.count("1") == len(RESOURCES)
+
+
+@pytest.mark.parametrize("account_concurrency", [1, 2])
+def test_account_ids_filter_skips_other_accounts(
+    make_tap, fake_api, capsys, account_concurrency
+):
+    fake_api.handler = AccountsAPI(account_count=4)
+
+    make_tap(account_ids="1,3", account_concurrency=account_concurrency).sync_all()
+
+    requested = {urlsplit(url).path.split("/")[-2] for url in fake_api.urls[1:]}
+    assert requested == {"1", "3"}
+    records = [
+        m["record"]
+        for m in _messages(capsys.readouterr().out)
+        if m["type"] == "RECORD" and m["stream"] == "items"
+    ]
+    assert sorted(record["itemID"] for record in records) == [
+        "1-0", "1-1", "3-0", "3-1"
+    ]
+
+
+def test_vendor_relations_missing_from_the_api_are_null(make_tap, fake_api, capsys):
+    fake_api.handler = AccountsAPI(account_count=1)
+
+    make_tap().sync_all()
+
+    records = {
+        m["stream"]: m["record"]
+        for m in _messages(capsys.readouterr().out)
+        if m["type"] == "RECORD"
+    }
+    for field in VendorStream.relation_fields:
+        assert records["vendors"][field] is None
+    # Other streams leave absent relations out of the record
+    assert "Category" not in records["items"]